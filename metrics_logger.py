@@ -0,0 +1,105 @@
+import os
+import time
+import numpy as np
+
+# Columns stored for every episode, as float64 records
+METRIC_COLUMNS = ('episode', 'reward', 'steps', 'epsilon')
+
+class MetricsLogger:
+    def __init__(self, filename='training_metrics.bin', chunk_size=4096, print_interval=2.0):
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self.print_interval = print_interval
+
+        # Episodes are buffered in a preallocated chunk and appended to disk
+        # whenever it fills, so memory use doesn't grow with the run length
+        self.buffer = np.zeros((chunk_size, len(METRIC_COLUMNS)))
+        self.buffered = 0
+        self.file = open(filename, 'wb')
+
+        # Running aggregates for the throttled console summary
+        self.last_print = time.monotonic()
+        self.window_episodes = 0
+        self.window_reward = 0.0
+        self.window_steps = 0
+
+    def log(self, episode, reward, steps, epsilon, best_reward):
+        self.buffer[self.buffered] = (episode, reward, steps, epsilon)
+        self.buffered += 1
+        if self.buffered == self.chunk_size:
+            self.flush()
+
+        self.window_episodes += 1
+        self.window_reward += reward
+        self.window_steps += steps
+        self.last_episode = episode
+        self.last_epsilon = epsilon
+        self.best_reward = best_reward
+        if time.monotonic() - self.last_print >= self.print_interval:
+            # Flush on the same timer so a live run's file stays current
+            self.flush()
+            self.print_summary()
+
+    def print_summary(self):
+        now = time.monotonic()
+        if self.window_episodes:
+            print(f"Episode {self.last_episode} | "
+                  f"Avg Reward: {self.window_reward / self.window_episodes:.1f} | "
+                  f"Avg Steps: {self.window_steps / self.window_episodes:.1f} | "
+                  f"Epsilon: {self.last_epsilon:.3f} | "
+                  f"Best Reward: {self.best_reward} | "
+                  f"{self.window_episodes / max(now - self.last_print, 1e-9):.0f} ep/s")
+        self.last_print = now
+        self.window_episodes = 0
+        self.window_reward = 0.0
+        self.window_steps = 0
+
+    def flush(self):
+        self.buffer[:self.buffered].tofile(self.file)
+        self.file.flush()
+        self.buffered = 0
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+        self.print_summary()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def load_metrics(filename='training_metrics.bin'):
+    # Memory-mapped view of the records; nothing is read until it is sliced.
+    # A live run may have flushed nothing yet or be halfway through a write,
+    # so only whole records are exposed
+    n_columns = len(METRIC_COLUMNS)
+    n_values = os.path.getsize(filename) // np.dtype(np.float64).itemsize
+    n_values = n_values // n_columns * n_columns
+    if n_values == 0:
+        return np.zeros((0, n_columns))
+    data = np.memmap(filename, dtype=np.float64, mode='r', shape=(n_values,))
+    return data.reshape(-1, n_columns)
+
+def downsample(values, max_points=2000):
+    # Aggregate into at most max_points buckets, returning the bucket start
+    # index together with the min, mean and max of every bucket
+    n = len(values)
+    if n == 0:
+        empty = np.zeros(0)
+        return empty, empty, empty, empty
+    bucket = max(1, -(-n // max_points))
+    n_full = n // bucket * bucket
+    full = np.asarray(values[:n_full]).reshape(-1, bucket)
+    starts = np.arange(0, n_full, bucket)
+    mins, means, maxs = full.min(axis=1), full.mean(axis=1), full.max(axis=1)
+    if n_full < n:
+        tail = np.asarray(values[n_full:])
+        starts = np.append(starts, n_full)
+        mins = np.append(mins, tail.min())
+        means = np.append(means, tail.mean())
+        maxs = np.append(maxs, tail.max())
+    return starts, mins, means, maxs
@@ -0,0 +1,122 @@
+import time
+import numpy as np
+from zombie_env_short import ZombieEnvironment
+from q_learning_agent import QLearningAgent
+
+# Bit weights for the alive flags of the L1, L10 and L100 zombies
+ALIVE_WEIGHTS = np.array([1, 2, 4])
+
+def state_ids(states, grid_size=8):
+    # Map a batch of observations (batch, grid, grid, 6) to compact state ids:
+    # alive_bits * grid_size**2 + player_row * grid_size + player_col
+    states = np.asarray(states)
+    if states.ndim == 3:
+        states = states[np.newaxis]
+    flat = states.reshape(states.shape[0], grid_size * grid_size, 6)
+    player_cell = np.argmax(flat[:, :, 0], axis=1)
+    alive_bits = (flat[:, :, 1:4] == 1).any(axis=1) @ ALIVE_WEIGHTS
+    return alive_bits * grid_size * grid_size + player_cell
+
+class CompiledPolicy:
+    def __init__(self, actions, q_values=None, grid_size=8):
+        self.grid_size = grid_size
+        self.actions = np.ascontiguousarray(actions, dtype=np.int8)
+        self.q_values = None if q_values is None else np.ascontiguousarray(q_values, dtype=np.float32)
+
+    def act(self, ids):
+        # Greedy actions for a batch of compact state ids in a single gather
+        return self.actions[ids]
+
+    def act_states(self, states):
+        return self.actions[state_ids(states, self.grid_size)]
+
+    def save(self, filename='policy.npz'):
+        arrays = {'actions': self.actions, 'grid_size': np.array(self.grid_size)}
+        if self.q_values is not None:
+            arrays['q_values'] = self.q_values
+        np.savez(filename, **arrays)
+
+    @classmethod
+    def load(cls, filename='policy.npz'):
+        data = np.load(filename)
+        q_values = data['q_values'] if 'q_values' in data.files else None
+        return cls(data['actions'], q_values, int(data['grid_size']))
+
+def compile_policy(agent, grid_size=8, include_q_values=False):
+    # Enumerate every (alive zombies, player cell) combination, rebuild the
+    # observation the environment would emit and look it up in the Q-table
+    env = ZombieEnvironment(grid_size=grid_size)
+    base_state, _ = env.reset()
+    n_cells = grid_size * grid_size
+    n_states = 2 ** len(ALIVE_WEIGHTS) * n_cells
+
+    actions = np.zeros(n_states, dtype=np.int8)
+    q_values = np.zeros((n_states, agent.action_size), dtype=np.float32) if include_q_values else None
+
+    for alive_bits in range(2 ** len(ALIVE_WEIGHTS)):
+        alive = [(alive_bits >> i) & 1 == 1 for i in range(len(ALIVE_WEIGHTS))]
+        layout = base_state.copy()
+        layout[:, :, 0] = 0
+        for i, pos in enumerate(env.zombie_positions):
+            layout[pos[0], pos[1], i + 1] = 1 if alive[i] else 0
+        if not any(alive):
+            layout[env.exit_pos[0], env.exit_pos[1], 4] = 1
+
+        for cell in range(n_cells):
+            row, col = divmod(cell, grid_size)
+            state = layout.copy()
+            state[row, col, 0] = 1
+            q = agent.q_table.get(agent._get_state_key(state))
+            if q is None:
+                q = np.zeros(agent.action_size)
+            state_id = alive_bits * n_cells + cell
+            actions[state_id] = np.argmax(q)
+            if q_values is not None:
+                q_values[state_id] = q
+
+    env.close()
+    return CompiledPolicy(actions, q_values, grid_size)
+
+def benchmark(policy, agent, grid_size=8, batch_size=4096, repeats=1000):
+    env = ZombieEnvironment(grid_size=grid_size)
+    state, _ = env.reset()
+    agent.epsilon = 0.0
+
+    # Per-decision latency of the dict agent vs the compiled lookup
+    start = time.perf_counter()
+    for _ in range(repeats):
+        agent.choose_action(state)
+    agent_latency = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        policy.act_states(state)
+    policy_latency = (time.perf_counter() - start) / repeats
+
+    # Batch throughput on precomputed state ids
+    ids = np.random.randint(0, len(policy.actions), size=batch_size)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        policy.act(ids)
+    batch_time = (time.perf_counter() - start) / repeats
+
+    env.close()
+    print(f"Agent choose_action: {agent_latency * 1e6:.2f} us/decision")
+    print(f"Compiled act_states: {policy_latency * 1e6:.2f} us/decision")
+    print(f"Compiled act (batch {batch_size}): {batch_time * 1e6:.2f} us/batch, "
+          f"{batch_size / batch_time:,.0f} decisions/s")
+    return agent_latency, policy_latency, batch_size / batch_time
+
+if __name__ == "__main__":
+    env = ZombieEnvironment()
+    agent = QLearningAgent(
+        state_size=(env.grid_size, env.grid_size, 6),
+        action_size=env.action_space.n
+    )
+    env.close()
+    agent.load_q_table()
+
+    policy = compile_policy(agent, grid_size=env.grid_size, include_q_values=True)
+    policy.save()
+    print(f"Exported {len(policy.actions)} states to policy.npz")
+    benchmark(policy, agent, grid_size=env.grid_size)
@@ -1,8 +1,104 @@
+import sys
 import numpy as np
 import random
 
+class BoundedQTable:
+    def __init__(self, max_states, action_size, evict_fraction=0.1):
+        if max_states < 2:
+            raise ValueError("max_states must be at least 2")
+        self.max_states = max_states
+        self.action_size = action_size
+        self.evict_count = min(max(1, int(max_states * evict_fraction)), max_states - 1)
+        
+        # Q-values live in one preallocated array; the dict only maps keys to rows
+        self.values = np.zeros((max_states, action_size))
+        self.visits = np.zeros(max_states, dtype=np.uint32)
+        self.slot_keys = [None] * max_states
+        self.index = {}
+        self.free_slots = list(range(max_states - 1, -1, -1))
+        self.last_slot = None
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __contains__(self, key):
+        slot = self.index.get(key)
+        if slot is not None:
+            self.hits += 1
+            self.last_slot = slot
+            return True
+        self.misses += 1
+        return False
+    
+    def get(self, key, default=None):
+        if key in self:
+            return self.values[self.index[key]]
+        return default
+    
+    def __getitem__(self, key):
+        slot = self.index[key]
+        self.visits[slot] += 1
+        self.last_slot = slot
+        return self.values[slot]
+    
+    def __setitem__(self, key, value):
+        slot = self.index.get(key)
+        if slot is None:
+            if not self.free_slots:
+                self._evict()
+            slot = self.free_slots.pop()
+            self.index[key] = slot
+            self.slot_keys[slot] = key
+            self.visits[slot] = 0
+        self.values[slot] = value
+        self.last_slot = slot
+    
+    def _evict(self):
+        # Drop the least visited states first, breaking ties by the smallest
+        # Q-value magnitude; the most recently used slot is always kept
+        magnitude = np.abs(self.values).max(axis=1)
+        visits = self.visits.astype(np.float64)
+        if self.last_slot is not None:
+            visits[self.last_slot] = np.inf
+        for slot in np.lexsort((magnitude, visits))[:self.evict_count]:
+            del self.index[self.slot_keys[slot]]
+            self.slot_keys[slot] = None
+            self.values[slot] = 0
+            self.free_slots.append(slot)
+        self.evictions += self.evict_count
+    
+    def __len__(self):
+        return len(self.index)
+    
+    def __iter__(self):
+        return iter(self.index)
+    
+    def keys(self):
+        return self.index.keys()
+    
+    def items(self):
+        return ((key, self.values[slot].copy()) for key, slot in self.index.items())
+    
+    def stats(self):
+        return {
+            'states': len(self.index),
+            'max_states': self.max_states,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'memory_bytes': self.memory_bytes(),
+        }
+    
+    def memory_bytes(self):
+        # Preallocated arrays plus the index dict, the slot list and the key
+        # strings themselves (shared by both, so counted once)
+        key_bytes = sum(sys.getsizeof(key) for key in self.index)
+        return (self.values.nbytes + self.visits.nbytes + sys.getsizeof(self.index)
+                + sys.getsizeof(self.slot_keys) + key_bytes)
+
 class QLearningAgent:
-    def __init__(self, state_size, action_size, learning_rate=0.2, discount_factor=0.99, epsilon=1.0, epsilon_min=0.01, epsilon_decay=0.995):
+    def __init__(self, state_size, action_size, learning_rate=0.2, discount_factor=0.99, epsilon=1.0, epsilon_min=0.01, epsilon_decay=0.995, max_states=None):
         self.state_size = state_size
         self.action_size = action_size
         self.learning_rate = learning_rate
@@ -11,8 +107,14 @@ class QLearningAgent:
         self.epsilon_min = epsilon_min
         self.epsilon_decay = epsilon_decay
         
-        # Initialize Q-table as a dictionary
-        self.q_table = {}
+        # Initialize Q-table as a dictionary, or a bounded store if capped
+        self.max_states = max_states
+        self.q_table = self._new_q_table()
+    
+    def _new_q_table(self):
+        if self.max_states is None:
+            return {}
+        return BoundedQTable(self.max_states, self.action_size)
     
     def _get_state_key(self, state):
         # Find player position
@@ -96,11 +198,14 @@ class QLearningAgent:
             self.epsilon *= self.epsilon_decay
     
     def save_q_table(self, filename='q_table.npy'):
-        np.save(filename, dict(self.q_table))
+        np.save(filename, dict(self.q_table.items()))
     
     def load_q_table(self, filename='q_table.npy'):
         try:
-            self.q_table = np.load(filename, allow_pickle=True).item()
+            loaded = np.load(filename, allow_pickle=True).item()
+            self.q_table = self._new_q_table()
+            for state_key, q_values in loaded.items():
+                self.q_table[state_key] = q_values
             print("Loaded Q-table from", filename)
         except:
             print("No saved Q-table found, starting fresh") 
\ No newline at end of file
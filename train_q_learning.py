@@ -1,11 +1,13 @@
+import sys
 import numpy as np
 from zombie_env_short import ZombieEnvironment
 from q_learning_agent import QLearningAgent
+from metrics_logger import MetricsLogger, load_metrics, downsample
 import matplotlib.pyplot as plt
 
-def train(episodes=5000):
+def train(episodes=5000, render_mode=None, metrics_file='training_metrics.bin', max_states=None):
     # Create environment and agent
-    env = ZombieEnvironment()
+    env = ZombieEnvironment(render_mode=render_mode)
     agent = QLearningAgent(
         state_size=(env.grid_size, env.grid_size, 6),
         action_size=env.action_space.n,
@@ -13,76 +15,73 @@ def train(episodes=5000):
         discount_factor=0.99,
         epsilon=1.0,
         epsilon_min=0.01,
-        epsilon_decay=0.995
+        epsilon_decay=0.995,
+        max_states=max_states
     )
     
-    # Training statistics
-    rewards_history = []
-    steps_history = []
+    # Training statistics are streamed to disk instead of kept in memory
+    metrics = MetricsLogger(metrics_file)
     best_reward = float('-inf')
     max_steps_per_episode = 200  # Maximum steps per episode
     
-    for episode in range(episodes):
-        state, _ = env.reset()
-        total_reward = 0
-        steps = 0
-        done = False
+    # Always flush buffered metrics, even when training is interrupted
+    try:
+        for episode in range(episodes):
+            state, _ = env.reset()
+            total_reward = 0
+            steps = 0
+            done = False
         
-        while not done and steps < max_steps_per_episode:
-            # Choose and perform action
-            action = agent.choose_action(state)
-            next_state, reward, done, _, info = env.step(action)
+            while not done and steps < max_steps_per_episode:
+                # Choose and perform action
+                action = agent.choose_action(state)
+                next_state, reward, terminated, truncated, info = env.step(action)
+                done = terminated or truncated
             
-            # Learn from the action
-            agent.learn(state, action, reward, next_state, done)
+                # Learn from the action (truncation still bootstraps)
+                agent.learn(state, action, reward, next_state, terminated)
             
-            state = next_state
-            total_reward += reward
-            steps += 1
-            
-            # Render every 100 episodes for visualization
-            if episode % 100 == 0:
-                env.render()
-        
-        # Record statistics
-        rewards_history.append(total_reward)
-        steps_history.append(steps)
+                state = next_state
+                total_reward += reward
+                steps += 1
         
-        # Update best reward
-        if total_reward > best_reward:
-            best_reward = total_reward
-            agent.save_q_table()  # Save the best Q-table
+            # Update best reward
+            if total_reward > best_reward:
+                best_reward = total_reward
+                agent.save_q_table()  # Save the best Q-table
         
-        # Print progress every 5 episodes
-        if episode % 5 == 0:
-            print(f"Episode: {episode}/{episodes}")
-            print(f"Total Reward: {total_reward}")
-            print(f"Steps: {steps}")
-            print(f"Epsilon: {agent.epsilon:.3f}")
-            print(f"Best Reward: {best_reward}")
-            print("--------------------")
+            # Record statistics (the logger throttles its own console output)
+            metrics.log(episode, total_reward, steps, agent.epsilon, best_reward)
         
-        # If we've achieved a good result, we can stop early
-        if total_reward > 5000:  # Successfully completed the game
-            print("Successfully solved the environment!")
-            break
-    
+            # If we've achieved a good result, we can stop early
+            if total_reward > 5000:  # Successfully completed the game
+                print("Successfully solved the environment!")
+                break
+    finally:
+        metrics.close()
+    if max_states is not None:
+        print("Q-table stats:", agent.q_table.stats())
     env.close()
-    return rewards_history, steps_history
+    return metrics_file
 
-def plot_results(rewards, steps):
+def plot_results(metrics_file='training_metrics.bin', max_points=2000):
+    data = load_metrics(metrics_file)
     plt.figure(figsize=(12, 5))
     
-    # Plot rewards
+    # Plot rewards as a min/max band around the per-bucket mean
     plt.subplot(1, 2, 1)
-    plt.plot(rewards)
+    x, low, mean, high = downsample(data[:, 1], max_points)
+    plt.fill_between(x, low, high, alpha=0.3)
+    plt.plot(x, mean)
     plt.title('Episode Rewards')
     plt.xlabel('Episode')
     plt.ylabel('Total Reward')
     
     # Plot steps
     plt.subplot(1, 2, 2)
-    plt.plot(steps)
+    x, low, mean, high = downsample(data[:, 2], max_points)
+    plt.fill_between(x, low, high, alpha=0.3)
+    plt.plot(x, mean)
     plt.title('Episode Steps')
     plt.xlabel('Episode')
     plt.ylabel('Steps')
@@ -91,5 +90,9 @@ def plot_results(rewards, steps):
     plt.show()
 
 if __name__ == "__main__":
-    rewards, steps = train()
-    plot_results(rewards, steps) 
\ No newline at end of file
+    # "python train_q_learning.py plot [file]" only plots an existing run
+    if len(sys.argv) > 1 and sys.argv[1] == 'plot':
+        plot_results(*sys.argv[2:3])
+    else:
+        metrics_file = train()
+        plot_results(metrics_file) 
\ No newline at end of file
@@ -5,10 +5,16 @@ from gymnasium import spaces
 import time
 import os
 
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+
 class ZombieEnvironment(gym.Env):
-    def __init__(self, grid_size=8):
+    metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 4}
+    
+    def __init__(self, grid_size=8, render_mode=None):
         super(ZombieEnvironment, self).__init__()
         
+        assert render_mode is None or render_mode in self.metadata["render_modes"]
+        self.render_mode = render_mode
         self.grid_size = grid_size
         self.window_size = 800
         self.cell_size = (self.window_size - 200) // self.grid_size
@@ -23,14 +29,11 @@ class ZombieEnvironment(gym.Env):
             dtype=np.float32
         )
         
-        # Initialize Pygame
-        pygame.init()
-        self.screen = pygame.display.set_mode((self.window_size, self.window_size))
-        pygame.display.set_caption("Castle Warrior RL")
-        
-        # Initialize fonts
-        self.font = pygame.font.Font(None, 24)
-        self.title_font = pygame.font.Font(None, 36)
+        # Pygame objects are created lazily on the first render so that a
+        # headless environment stays picklable (e.g. for AsyncVectorEnv)
+        self.screen = None
+        self.font = None
+        self.title_font = None
         
         # Movement delay (in seconds)
         self.delay = 0.001  # Much faster movement
@@ -57,19 +60,41 @@ class ZombieEnvironment(gym.Env):
         ]
         self.fixed_exit_pos = (6, 1)
         
+        self.reset()
+    
+    def __getstate__(self):
+        # Surfaces and fonts can't be pickled; they are rebuilt on next render
+        state = self.__dict__.copy()
+        for key in ('screen', 'font', 'title_font', 'warrior_img', 'zombie1_img',
+                    'zombie10_img', 'zombie100_img', 'exit_img'):
+            state.pop(key, None)
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.screen = None
+        self.font = None
+        self.title_font = None
+    
+    def _init_pygame(self):
+        pygame.init()
+        if self.render_mode == "human":
+            self.screen = pygame.display.set_mode((self.window_size, self.window_size))
+            pygame.display.set_caption("Castle Warrior RL")
+        else:
+            self.screen = pygame.Surface((self.window_size, self.window_size))
+        
+        # Initialize fonts
+        self.font = pygame.font.Font(None, 24)
+        self.title_font = pygame.font.Font(None, 36)
+        
         # Load images
         self.load_images()
-        
-        self.reset()
     
     def load_images(self):
-        # Create assets directory if it doesn't exist
-        if not os.path.exists('assets'):
-            os.makedirs('assets')
-        
         # Try to load images, if they don't exist, create placeholders
         try:
-            self.warrior_img = pygame.image.load('assets/warrior.png')
+            self.warrior_img = pygame.image.load(os.path.join(ASSETS_DIR, 'warrior.png'))
             self.warrior_img = pygame.transform.scale(self.warrior_img, (self.cell_size - 4, self.cell_size - 4))
         except:
             # Create a placeholder warrior icon
@@ -78,40 +103,38 @@ class ZombieEnvironment(gym.Env):
             pygame.draw.rect(self.warrior_img, (0, 0, 0), (0, 0, self.cell_size - 4, self.cell_size - 4), 2)
         
         try:
-            self.zombie1_img = pygame.image.load('assets/zombie1.png')
+            self.zombie1_img = pygame.image.load(os.path.join(ASSETS_DIR, 'zombie1.png'))
             self.zombie1_img = pygame.transform.scale(self.zombie1_img, (self.cell_size - 4, self.cell_size - 4))
         except:
             self.zombie1_img = pygame.Surface((self.cell_size - 4, self.cell_size - 4))
             self.zombie1_img.fill(self.COLORS['zombie1'])
         
         try:
-            self.zombie10_img = pygame.image.load('assets/zombie10.png')
+            self.zombie10_img = pygame.image.load(os.path.join(ASSETS_DIR, 'zombie10.png'))
             self.zombie10_img = pygame.transform.scale(self.zombie10_img, (self.cell_size - 4, self.cell_size - 4))
         except:
             self.zombie10_img = pygame.Surface((self.cell_size - 4, self.cell_size - 4))
             self.zombie10_img.fill(self.COLORS['zombie10'])
         
         try:
-            self.zombie100_img = pygame.image.load('assets/zombie100.png')
+            self.zombie100_img = pygame.image.load(os.path.join(ASSETS_DIR, 'zombie100.png'))
             self.zombie100_img = pygame.transform.scale(self.zombie100_img, (self.cell_size - 4, self.cell_size - 4))
         except:
             self.zombie100_img = pygame.Surface((self.cell_size - 4, self.cell_size - 4))
             self.zombie100_img.fill(self.COLORS['zombie100'])
         
         try:
-            self.exit_img = pygame.image.load('assets/castle_door.png')
+            self.exit_img = pygame.image.load(os.path.join(ASSETS_DIR, 'castle_door.png'))
             self.exit_img = pygame.transform.scale(self.exit_img, (self.cell_size - 4, self.cell_size - 4))
         except:
             self.exit_img = pygame.Surface((self.cell_size - 4, self.cell_size - 4))
             self.exit_img.fill(self.COLORS['exit'])
-        
-        self.reset()
     
-    def reset(self, seed=None):
+    def reset(self, seed=None, options=None):
         super().reset(seed=seed)
         
         # Initialize state with an extra channel for walls
-        self.state = np.zeros((self.grid_size, self.grid_size, 6))
+        self.state = np.zeros((self.grid_size, self.grid_size, 6), dtype=np.float32)
         
         # Create a maze-like structure with walls
         # Fixed positions that should not have walls
@@ -159,12 +182,15 @@ class ZombieEnvironment(gym.Env):
         self.exit_revealed = False
         self.steps = 0
         self.total_reward = 0
-        return self.state, {}
+        
+        if self.render_mode == "human":
+            self.render()
+        return self.state.copy(), {}
     
     def _get_random_position(self):
         return (
-            np.random.randint(0, self.grid_size),
-            np.random.randint(0, self.grid_size)
+            self.np_random.integers(0, self.grid_size),
+            self.np_random.integers(0, self.grid_size)
         )
     
     def _is_position_occupied(self, pos):
@@ -177,7 +203,8 @@ class ZombieEnvironment(gym.Env):
     def step(self, action):
         self.steps += 1
         reward = -0.5  # Smaller negative reward for each step
-        done = False
+        terminated = False
+        truncated = False
         info = {"action": action}
         
         # Store old position
@@ -252,24 +279,30 @@ class ZombieEnvironment(gym.Env):
                             reward += 500  # Big reward for killing all zombies
                     else:
                         reward = -200  # Bigger penalty for wrong order
-                        done = True
+                        terminated = True
         
         # Check if player reached the exit
         if self.exit_revealed and tuple(self.player_pos) == self.exit_pos:
             reward += 5000  # Much bigger completion bonus
-            done = True
+            terminated = True
         
         # End episode if too many steps
         if self.steps >= 100:
-            done = True
+            truncated = not terminated
         
         self.total_reward += reward
-        self.render(info)
-        time.sleep(1.5)  # Even slower for better visualization
+        if self.render_mode == "human":
+            self.render()
+            time.sleep(1.5)  # Even slower for better visualization
         
-        return self.state, reward, done, False, info
+        return self.state.copy(), float(reward), terminated, truncated, info
     
-    def render(self, info=None):
+    def render(self):
+        if self.render_mode is None:
+            return None
+        if self.screen is None:
+            self._init_pygame()
+        
         # Fill background with stone texture
         self.screen.fill(self.COLORS['background'])
         
@@ -353,7 +386,22 @@ class ZombieEnvironment(gym.Env):
         reward_text = self.font.render(f"Gold: {self.total_reward}", True, self.COLORS['text'])
         self.screen.blit(reward_text, (self.window_size - 190, y_offset))
         
-        pygame.display.flip()
+        if self.render_mode == "human":
+            pygame.event.pump()
+            pygame.display.flip()
+            return None
+        return np.transpose(np.array(pygame.surfarray.pixels3d(self.screen)), axes=(1, 0, 2))
     
     def close(self):
-        pygame.quit() 
\ No newline at end of file
+        if self.screen is not None:
+            pygame.quit()
+            self.screen = None
+            self.font = None
+            self.title_font = None
+
+
+gym.register(
+    id="ZombieEscape-v0",
+    entry_point="zombie_env_short:ZombieEnvironment",
+    kwargs={"grid_size": 8, "render_mode": None},
+)